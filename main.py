@@ -1,25 +1,62 @@
 import os
-import uuid
+import hashlib
+import secrets
 import logging
+import time
+import random
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-import requests
+import httpx
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl, Field
 
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI(title="Cert Webhook API", version="1.0.0")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Create the shared async HTTP clients, draining background processing before closing them."""
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        headers={"Content-Type": "application/json"},
+    )
+    # Separate pool for webhooks; HTTP/2 multiplexes deliveries to the same receiver
+    app.state.webhook_http = httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(WEBHOOK_TIMEOUT),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        yield
+    finally:
+        # Let in-flight cert processing finish before its clients are closed
+        if _background_tasks:
+            await asyncio.wait(set(_background_tasks), timeout=SHUTDOWN_GRACE_PERIOD)
+        for task in _background_tasks:
+            task.cancel()
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+        await app.state.http.aclose()
+        await app.state.webhook_http.aclose()
+
+
+app = FastAPI(title="Cert Webhook API", version="1.0.0", lifespan=_lifespan)
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -30,140 +67,369 @@ CERT_API_AUTH_KEY = os.getenv("CERT_API_AUTH_KEY", "")
 WEBHOOK_TIMEOUT = int(os.getenv("WEBHOOK_TIMEOUT", "30"))
 WEBHOOK_RETRY_COUNT = int(os.getenv("WEBHOOK_RETRY_COUNT", "3"))
 WEBHOOK_RETRY_DELAY = int(os.getenv("WEBHOOK_RETRY_DELAY", "5"))
+WEBHOOK_RETRY_MAX_DELAY = int(os.getenv("WEBHOOK_RETRY_MAX_DELAY", "300"))
+CERT_API_CONCURRENCY = int(os.getenv("CERT_API_CONCURRENCY", "20"))
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "50"))
+REQUEST_TRACKING_TTL = int(os.getenv("REQUEST_TRACKING_TTL", "86400"))
+STATUS_STREAM_HEARTBEAT = int(os.getenv("STATUS_STREAM_HEARTBEAT", "30"))
+CERT_API_CACHE_TTL = int(os.getenv("CERT_API_CACHE_TTL", "30"))
+CERT_API_CACHE_SIZE = int(os.getenv("CERT_API_CACHE_SIZE", "10000"))
+CERT_API_BREAKER_FAIL_MAX = int(os.getenv("CERT_API_BREAKER_FAIL_MAX", "5"))
+CERT_API_BREAKER_RESET_TIMEOUT = int(os.getenv("CERT_API_BREAKER_RESET_TIMEOUT", "30"))
+MAX_PENDING_REQUESTS = int(os.getenv("MAX_PENDING_REQUESTS", "1000"))
+SHUTDOWN_GRACE_PERIOD = int(os.getenv("SHUTDOWN_GRACE_PERIOD", "120"))
+
+# Request-invariant cert API endpoints and headers
+_ADD_URL = f"{CERT_API_BASE_URL}/api/v1.0/cert/add"
+_REJECT_URL = f"{CERT_API_BASE_URL}/api/v1.0/cert/reject"
+_CERT_HEADERS = {
+    "Content-Type": "application/json",
+    **({"X-AUTH-KEY": CERT_API_AUTH_KEY} if CERT_API_AUTH_KEY else {}),
+}
+_OPPOSITE_URL = {_ADD_URL: _REJECT_URL, _REJECT_URL: _ADD_URL}
 
-# Storage for tracking requests
+# Storage for tracking requests. Only touched from the event loop thread and records are
+# replaced wholesale (see _update_tracking), so no locking is needed; keep it that way.
 request_tracking: Dict[str, Dict[str, Any]] = {}
 
-# Thread pool executor for blocking I/O operations
-executor = ThreadPoolExecutor(max_workers=10)
+# (expires_at, request_id) in insertion order, used to evict stale tracking entries
+_tracking_expiry: Deque[Tuple[float, str]] = deque()
+
+# Per-request queues of status stream subscribers
+_status_listeners: Dict[str, List[asyncio.Queue]] = {}
+
+# Short-lived cache of successful cert/reject API responses: key -> (expires_at, result)
+_api_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Single-flight map: cache key -> future resolving to the in-flight upstream call's outcome
+_inflight: Dict[str, "asyncio.Future[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]"] = {}
+
+# Strong references to in-flight background tasks so they are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+# Separate concurrency lanes so webhook deliveries never starve cert creation (and vice versa)
+_cert_api_slots = asyncio.Semaphore(CERT_API_CONCURRENCY)
+_webhook_slots = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for the cert API host.
+    After fail_max failures calls are short-circuited for reset_timeout seconds,
+    then a single trial call is let through to probe whether the host recovered.
+    """
+
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_in_flight = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.half_open_in_flight:
+            return False
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        # Half-open: only this call probes the host until it reports an outcome
+        self.half_open_in_flight = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.half_open_in_flight = False
+        if self.failures >= self.fail_max:
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        self.half_open_in_flight = False
+
+
+_cert_breaker = _CircuitBreaker(CERT_API_BREAKER_FAIL_MAX, CERT_API_BREAKER_RESET_TIMEOUT)
 
 
 # Pydantic models for request validation
-class CertAddRequest(BaseModel):
+class CertRequest(BaseModel):
     callback_url: HttpUrl
     cname_id: str
     domain: str
     email: str
     user_id: str
 
+    def api_payload(self) -> Dict[str, Any]:
+        """Fields forwarded to the external cert API (callback_url is for our webhook only)."""
+        return self.model_dump(exclude={"callback_url"})
 
-class CertRejectRequest(BaseModel):
-    callback_url: HttpUrl
-    cname_id: str
-    domain: str
-    email: str
-    user_id: str
+
+class CertAddRequest(CertRequest):
+    pass
+
+
+class CertRejectRequest(CertRequest):
+    pass
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Schedule a coroutine in the background and keep a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a 'Z' suffix."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _prune_tracking():
+    """Drop tracking entries older than REQUEST_TRACKING_TTL."""
+    now = time.monotonic()
+    while _tracking_expiry and _tracking_expiry[0][0] <= now:
+        _, request_id = _tracking_expiry.popleft()
+        request_tracking.pop(request_id, None)
+
+
+def _track(request_id: str, record: Dict[str, Any]):
+    """Start tracking a request; the entry expires after REQUEST_TRACKING_TTL seconds."""
+    _prune_tracking()
+    request_tracking[request_id] = record
+    _tracking_expiry.append((time.monotonic() + REQUEST_TRACKING_TTL, request_id))
+    _publish_status(request_id, record)
+
+
+def _update_tracking(request_id: str, record: Dict[str, Any]):
+    """Replace a tracked request's record in one assignment, unless it has already expired."""
+    if request_id in request_tracking:
+        request_tracking[request_id] = record
+    _publish_status(request_id, record)
+
+
+def _cache_key(api_url: str, request_data: Dict[str, Any]) -> str:
+    """Build a compact cache key from the API URL and request payload."""
+    raw = orjson.dumps([api_url, request_data], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return a cached API result, or None if missing or expired."""
+    entry = _api_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _api_cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def _cache_set(key: str, result: Dict[str, Any]):
+    """Cache an API result for CERT_API_CACHE_TTL seconds, evicting the oldest entry when full."""
+    if CERT_API_CACHE_TTL <= 0:
+        return
+    _api_cache.pop(key, None)
+    if len(_api_cache) >= CERT_API_CACHE_SIZE:
+        _api_cache.pop(next(iter(_api_cache)))
+    _api_cache[key] = (time.monotonic() + CERT_API_CACHE_TTL, result)
+
+
+def _publish_status(request_id: str, record: Dict[str, Any]):
+    """Push a tracking record to any status stream subscribers."""
+    for queue in _status_listeners.get(request_id, ()):
+        queue.put_nowait(record)
+
+
+def _is_settled(record: Dict[str, Any]) -> bool:
+    """Whether a tracking record has reached its final state."""
+    return record["status"] == "failed" or "webhook_status" in record
 
 
-def _send_webhook(callback_url: str, payload: Dict[str, Any], retry_count: int = 0) -> bool:
+async def _send_webhook(callback_url: str, payload: Dict[str, Any]) -> bool:
     """
     Send webhook to callback_url with retry logic.
+    Retries use exponential backoff with full jitter, capped at WEBHOOK_RETRY_MAX_DELAY.
     Returns True if successful, False otherwise.
     """
-    try:
-        logger.info(f"Sending webhook to {callback_url}, attempt {retry_count + 1}")
-        response = requests.post(
-            str(callback_url),
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=WEBHOOK_TIMEOUT,
-        )
-        response.raise_for_status()
-        logger.info(f"Webhook sent successfully to {callback_url}, status: {response.status_code}")
-        return True
-    except requests.exceptions.Timeout:
-        logger.warning(f"Webhook timeout to {callback_url}, attempt {retry_count + 1}")
-        if retry_count < WEBHOOK_RETRY_COUNT - 1:
-            import time
-            time.sleep(WEBHOOK_RETRY_DELAY)
-            return _send_webhook(callback_url, payload, retry_count + 1)
-        logger.error(f"Failed to send webhook to {callback_url} after {WEBHOOK_RETRY_COUNT} attempts")
-        return False
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Webhook error to {callback_url}: {str(e)}, attempt {retry_count + 1}")
-        if retry_count < WEBHOOK_RETRY_COUNT - 1:
-            import time
-            time.sleep(WEBHOOK_RETRY_DELAY)
-            return _send_webhook(callback_url, payload, retry_count + 1)
-        logger.error(f"Failed to send webhook to {callback_url} after {WEBHOOK_RETRY_COUNT} attempts")
-        return False
-
-
-def _call_cert_api(request_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    for attempt in range(WEBHOOK_RETRY_COUNT):
+        try:
+            logger.info("Sending webhook to %s, attempt %d", callback_url, attempt + 1)
+            async with _webhook_slots:
+                response = await app.state.webhook_http.post(
+                    str(callback_url),
+                    content=orjson.dumps(payload),
+                )
+            response.raise_for_status()
+            logger.info("Webhook sent successfully to %s, status: %d", callback_url, response.status_code)
+            return True
+        except httpx.TimeoutException:
+            logger.warning("Webhook timeout to %s, attempt %d", callback_url, attempt + 1)
+        except httpx.HTTPError as e:
+            logger.error("Webhook error to %s: %s, attempt %d", callback_url, e, attempt + 1)
+        if attempt < WEBHOOK_RETRY_COUNT - 1:
+            await asyncio.sleep(random.uniform(0, min(WEBHOOK_RETRY_MAX_DELAY, WEBHOOK_RETRY_DELAY * (2 ** attempt))))
+    logger.error("Failed to send webhook to %s after %d attempts", callback_url, WEBHOOK_RETRY_COUNT)
+    return False
+
+
+async def _post_cert_api(
+    api_url: str, request_data: Dict[str, Any], timeout: float, label: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """
-    Call the external cert API and return the response.
+    POST request_data to an external cert API endpoint and return the response.
+    Identical concurrent calls are coalesced into a single upstream request.
     Returns: (result, error_info) where error_info is None if successful.
     """
-    api_url = f"{CERT_API_BASE_URL}/api/v1.0/cert/add"
+    cache_key = _cache_key(api_url, request_data)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        logger.info("%s response served from cache for domain %s", label, request_data.get("domain"))
+        return cached, None
     
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        logger.info("%s call already in flight for domain %s, sharing its result", label, request_data.get("domain"))
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+            # The owning call was cancelled; report it as a failed call rather than crashing
+            return None, {
+                "error_type": "request_error",
+                "message": f"Shared {label} call was cancelled",
+                "api_url": api_url,
+            }
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
     try:
-        logger.info(f"Calling cert API: {api_url}")
-        headers = {
-            "Content-Type": "application/json",
-        }
-        if CERT_API_AUTH_KEY:
-            headers["X-AUTH-KEY"] = CERT_API_AUTH_KEY
-        
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers=headers,
-            timeout=60,  # Longer timeout for cert generation
-        )
-        response.raise_for_status()
-        
-        result = response.json()
-        logger.info(f"Cert API response received, status: {response.status_code}")
-        return result, None
-        
-    except requests.exceptions.Timeout:
-        error_info = {
-            "error_type": "timeout",
-            "message": "Cert API request timed out",
-            "api_url": api_url,
-        }
-        logger.error(f"Cert API timeout: {api_url}")
-        return None, error_info
-    except requests.exceptions.HTTPError as e:
-        error_info = {
-            "error_type": "http_error",
-            "status_code": e.response.status_code if e.response else None,
-            "message": str(e),
-            "api_url": api_url,
-        }
         try:
-            if e.response:
-                error_info["response_body"] = e.response.json()
-        except:
-            pass
-        logger.error(f"Cert API HTTP error: {e.response.status_code if e.response else 'unknown'} - {str(e)}")
-        return None, error_info
-    except requests.exceptions.RequestException as e:
-        error_info = {
-            "error_type": "request_error",
-            "message": str(e),
-            "api_url": api_url,
-        }
-        logger.error(f"Cert API error: {str(e)}")
-        return None, error_info
+            outcome = await _fetch_cert_api(api_url, request_data, timeout, label, cache_key)
+        except Exception as e:
+            # Resolve waiters with an error outcome; the future only ever carries a value
+            logger.exception("%s call failed unexpectedly", label)
+            outcome = None, {
+                "error_type": "request_error",
+                "message": str(e),
+                "api_url": api_url,
+            }
+        future.set_result(outcome)
+        return outcome
+    finally:
+        _inflight.pop(cache_key, None)
+        if not future.done():
+            future.cancel()
+
+
+async def _fetch_cert_api(
+    api_url: str, request_data: Dict[str, Any], timeout: float, label: str, cache_key: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Perform the upstream call for _post_cert_api, caching successful results under cache_key."""
+    # Check the breaker only once a slot is held, so queued calls don't hit a host that just failed
+    async with _cert_api_slots:
+        if not _cert_breaker.allow():
+            logger.warning("%s circuit open, skipping call to %s", label, api_url)
+            return None, {
+                "error_type": "circuit_open",
+                "message": f"{label} unavailable after repeated failures, retry later",
+                "api_url": api_url,
+            }
+
+        try:
+            logger.info("Calling %s: %s", label, api_url)
+            response = await app.state.http.post(
+                api_url,
+                content=orjson.dumps(request_data),
+                headers=_CERT_HEADERS,
+                timeout=timeout,
+            )
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            _cert_breaker.record_success()
+            logger.info("%s response received, status: %d", label, response.status_code)
+            _cache_set(cache_key, result)
+            # An add undoes a reject (and vice versa), so the other endpoint's cached result is stale
+            _api_cache.pop(_cache_key(_OPPOSITE_URL[api_url], request_data), None)
+            return result, None
+
+        except httpx.TimeoutException:
+            _cert_breaker.record_failure()
+            error_info = {
+                "error_type": "timeout",
+                "message": f"{label} request timed out",
+                "api_url": api_url,
+            }
+            logger.error("%s timeout: %s", label, api_url)
+            return None, error_info
+        except httpx.HTTPStatusError as e:
+            # Client errors mean the host is up; only server errors count towards the breaker
+            if e.response.status_code >= 500:
+                _cert_breaker.record_failure()
+            else:
+                _cert_breaker.record_success()
+            error_info = {
+                "error_type": "http_error",
+                "status_code": e.response.status_code if e.response is not None else None,
+                "message": str(e),
+                "api_url": api_url,
+            }
+            try:
+                if e.response is not None:
+                    error_info["response_body"] = orjson.loads(e.response.content)
+            except:
+                pass
+            logger.error("%s HTTP error: %s - %s", label, error_info["status_code"] or "unknown", e)
+            return None, error_info
+        except (httpx.HTTPError, ValueError) as e:
+            _cert_breaker.record_failure()
+            error_info = {
+                "error_type": "request_error",
+                "message": str(e),
+                "api_url": api_url,
+            }
+            logger.error("%s error: %s", label, e)
+            return None, error_info
+        except BaseException:
+            # Cancelled or crashed before an outcome; let another call probe the host
+            _cert_breaker.release_probe()
+            raise
+
+
+async def _call_cert_api(request_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Call the external cert API and return the response.
+    Returns: (result, error_info) where error_info is None if successful.
+    """
+    # Longer timeout for cert generation
+    return await _post_cert_api(_ADD_URL, request_data, 60, "Cert API")
 
 
-def _process_cert_request(request_id: str, request_data: Dict[str, Any], callback_url: str):
+async def _process_cert_request(request_id: str, request_data: Dict[str, Any], callback_url: str):
     """
     Background task: Call cert API and send result to callback_url.
     """
-    logger.info(f"Processing cert request {request_id} for domain {request_data.get('domain')}")
+    logger.info("Processing cert request %s for domain %s", request_id, request_data.get("domain"))
     
-    # Update tracking
-    request_tracking[request_id] = {
+    # Update tracking; records are replaced wholesale, never mutated in place
+    state = {
         "status": "processing",
-        "requested_at": datetime.now(timezone.utc).isoformat() + "Z",
+        "requested_at": _now_iso(),
         "domain": request_data.get("domain"),
         "callback_url": str(callback_url),
     }
+    _track(request_id, state)
     
     # Call external cert API
-    api_result, error_info = _call_cert_api(request_data)
+    api_result, error_info = await _call_cert_api(request_data)
+    
+    completed_at = _now_iso()
     
     if api_result is None:
         # API call failed
@@ -172,14 +438,13 @@ def _process_cert_request(request_id: str, request_data: Dict[str, Any], callbac
             "request_id": request_id,
             "message": "Failed to call cert API",
             "domain": request_data.get("domain"),
-            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+            "timestamp": completed_at,
         }
         if error_info:
             error_payload["error_details"] = error_info
         
-        request_tracking[request_id]["status"] = "failed"
-        request_tracking[request_id]["error"] = error_info or "API call failed"
-        _send_webhook(str(callback_url), error_payload)
+        _update_tracking(request_id, state | {"status": "failed", "error": error_info or "API call failed"})
+        await _send_webhook(str(callback_url), error_payload)
         return
     
     # API call succeeded, send result to callback_url
@@ -187,48 +452,38 @@ def _process_cert_request(request_id: str, request_data: Dict[str, Any], callbac
         "status": "success",
         "request_id": request_id,
         "domain": request_data.get("domain"),
-        "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+        "timestamp": completed_at,
         "cert_data": api_result,
     }
     
-    request_tracking[request_id]["status"] = "completed"
-    request_tracking[request_id]["completed_at"] = datetime.now(timezone.utc).isoformat() + "Z"
-    request_tracking[request_id]["result"] = api_result
+    state = state | {"status": "completed", "completed_at": completed_at, "result": api_result}
+    _update_tracking(request_id, state)
     
     # Send webhook to callback_url
-    webhook_sent = _send_webhook(str(callback_url), webhook_payload)
-    if not webhook_sent:
-        request_tracking[request_id]["webhook_status"] = "failed"
-    else:
-        request_tracking[request_id]["webhook_status"] = "sent"
+    webhook_sent = await _send_webhook(str(callback_url), webhook_payload)
+    _update_tracking(request_id, state | {"webhook_status": "sent" if webhook_sent else "failed"})
 
 
 @app.post("/api/v1.0/cert/add", status_code=202)
-async def cert_add(request: CertAddRequest, background_tasks: BackgroundTasks):
+async def cert_add(request: CertAddRequest):
     """
     Webhook SENDER endpoint.
     Receives request from system, calls external cert API, and sends result to callback_url.
     """
+    # Apply backpressure instead of accepting unbounded background work
+    if len(_background_tasks) >= MAX_PENDING_REQUESTS:
+        raise HTTPException(status_code=429, detail="Too many requests in progress, retry later")
+    
     # Generate request ID
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(16)
     
     # Prepare request data for external API (remove callback_url as it's for our webhook)
-    request_data = {
-        "cname_id": request.cname_id,
-        "domain": request.domain,
-        "email": request.email,
-        "user_id": request.user_id,
-    }
+    request_data = request.api_payload()
     
-    # Add background task
-    background_tasks.add_task(
-        _process_cert_request,
-        request_id,
-        request_data,
-        request.callback_url
-    )
+    # Schedule background processing on the event loop
+    _spawn(_process_cert_request(request_id, request_data, request.callback_url))
     
-    logger.info(f"Cert request {request_id} queued for processing, callback_url: {request.callback_url}")
+    logger.info("Cert request %s queued for processing, callback_url: %s", request_id, request.callback_url)
     
     # Return immediate response
     return {
@@ -239,38 +494,12 @@ async def cert_add(request: CertAddRequest, background_tasks: BackgroundTasks):
     }
 
 
-def _call_reject_api(request_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+async def _call_reject_api(request_data: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """
     Call the external reject API and return the response.
     Returns: (result, error_info) where error_info is None if successful.
     """
-    api_url = f"{CERT_API_BASE_URL}/api/v1.0/cert/reject"
-    
-    try:
-        headers = {
-            "Content-Type": "application/json",
-        }
-        if CERT_API_AUTH_KEY:
-            headers["X-AUTH-KEY"] = CERT_API_AUTH_KEY
-        
-        response = requests.post(
-            api_url,
-            json=request_data,
-            headers=headers,
-            timeout=30,
-        )
-        response.raise_for_status()
-        api_result = response.json()
-        return api_result, None
-        
-    except requests.exceptions.RequestException as e:
-        error_info = {
-            "error_type": "request_error",
-            "message": str(e),
-            "api_url": api_url,
-        }
-        logger.error(f"Reject API error: {str(e)}")
-        return None, error_info
+    return await _post_cert_api(_REJECT_URL, request_data, 30, "Reject API")
 
 
 @app.post("/api/v1.0/cert/reject")
@@ -279,23 +508,13 @@ async def cert_reject(request: CertRejectRequest, background_tasks: BackgroundTa
     Webhook SENDER endpoint for rejecting cert.
     Calls external reject API and sends result to callback_url.
     """
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(16)
     
     # Prepare request data for external API
-    request_data = {
-        "cname_id": request.cname_id,
-        "domain": request.domain,
-        "email": request.email,
-        "user_id": request.user_id,
-    }
+    request_data = request.api_payload()
     
-    # Call external reject API in thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    api_result, error_info = await loop.run_in_executor(
-        executor,
-        _call_reject_api,
-        request_data
-    )
+    # Call external reject API
+    api_result, error_info = await _call_reject_api(request_data)
     
     if api_result is None:
         # API call failed
@@ -305,7 +524,7 @@ async def cert_reject(request: CertRejectRequest, background_tasks: BackgroundTa
             "action": "reject",
             "message": f"Failed to process reject request: {error_info.get('message', 'Unknown error') if error_info else 'Unknown error'}",
             "domain": request.domain,
-            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+            "timestamp": _now_iso(),
         }
         if error_info:
             error_payload["error_details"] = error_info
@@ -322,7 +541,7 @@ async def cert_reject(request: CertRejectRequest, background_tasks: BackgroundTa
         "request_id": request_id,
         "action": "reject",
         "domain": request.domain,
-        "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+        "timestamp": _now_iso(),
         "result": api_result,
     }
     
@@ -338,11 +557,45 @@ async def cert_reject(request: CertRejectRequest, background_tasks: BackgroundTa
 @app.get("/status/{request_id}")
 async def get_status(request_id: str):
     """Get status of a cert request."""
+    _prune_tracking()
     if request_id not in request_tracking:
         raise HTTPException(status_code=404, detail="Request not found")
     return request_tracking[request_id]
 
 
+@app.get("/status/stream/{request_id}")
+async def stream_status(request_id: str):
+    """Stream status changes of a cert request as Server-Sent Events until it settles."""
+    _prune_tracking()
+    if request_id not in request_tracking:
+        raise HTTPException(status_code=404, detail="Request not found")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    _status_listeners.setdefault(request_id, []).append(queue)
+    
+    async def event_generator():
+        try:
+            record = request_tracking.get(request_id)
+            while True:
+                if record is not None:
+                    yield f"data: {orjson.dumps(record).decode()}\n\n"
+                    if _is_settled(record):
+                        return
+                try:
+                    record = await asyncio.wait_for(queue.get(), timeout=STATUS_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    record = None
+                    yield ": keep-alive\n\n"
+        finally:
+            listeners = _status_listeners.get(request_id, [])
+            if queue in listeners:
+                listeners.remove(queue)
+            if not listeners:
+                _status_listeners.pop(request_id, None)
+    
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -350,6 +603,7 @@ async def health():
 
 
 if __name__ == "__main__":
+    # Development server only; production runs uvicorn directly (see Dockerfile)
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
     uvicorn.run(app, host="0.0.0.0", port=port)